@@ -1,10 +1,13 @@
 from __future__ import annotations
 import ast
+import io
 import json
-import re
 import textwrap
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -20,6 +23,101 @@ from langflow.io import (
 )
 from langflow.schema import Data
 
+# PDF rendering
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen import canvas
+    from reportlab.graphics import renderPDF
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.graphics.charts.barcharts import VerticalBarChart
+    from reportlab.graphics.charts.piecharts import Pie
+    from reportlab.platypus import Table, TableStyle
+except ImportError as e:
+    raise RuntimeError(
+        "Missing dependency: reportlab. Install with: pip install reportlab"
+    ) from e
+
+# Faster JSON decoding: orjson ships with Langflow, the stdlib parser is the fallback
+try:
+    from orjson import loads as _fast_json_loads
+except ImportError:
+    _fast_json_loads = json.loads
+
+# ---------- Colors ----------
+C_PRIMARY = colors.HexColor('#2C3E50')
+C_ACCENT = colors.HexColor('#3498DB')
+C_SUCCESS = colors.HexColor('#27AE60')
+C_WARN = colors.HexColor('#E67E22')
+C_PURPLE = colors.HexColor('#8E44AD')
+C_MUTED = colors.HexColor('#7F8C8D')
+C_SUBTLE = colors.HexColor('#95A5A6')
+C_BG_ROW = colors.HexColor('#ECF0F1')
+C_BG_SUMMARY = colors.HexColor('#EBF5FB')
+C_BG_CARD = colors.HexColor('#F8F9FA')
+C_BORDER = colors.HexColor('#BDC3C7')
+
+HEADER_GRADIENT = (
+    C_PRIMARY,
+    colors.HexColor('#34495E'),
+    colors.HexColor('#3D5A6C'),
+)
+
+PIE_PALETTE = (
+    C_ACCENT,
+    colors.HexColor('#2ECC71'),
+    colors.HexColor('#F39C12'),
+    colors.HexColor('#E74C3C'),
+    colors.HexColor('#9B59B6'),
+    colors.HexColor('#1ABC9C'),
+    colors.HexColor('#34495E'),
+    colors.HexColor('#F1C40F'),
+)
+
+# ---------- Layout ----------
+MARGIN = 2 * cm                   # Left/right page margin
+BOTTOM_MARGIN = 2 * cm            # Footer rule; content must stay above it
+PAGE_TOP_Y = 27 * cm              # Where content resumes after a page break
+HEADER_HEIGHT = 3 * cm
+HEADER_TITLE_Y = 1.8 * cm         # Offsets below the page top
+HEADER_DATE_Y = 2.3 * cm
+HEADER_GAP = 0.5 * cm
+TABLE_MAX_HEIGHT = 20 * cm
+CARD_WIDTH = 7 * cm
+CARD_HEIGHT = 2 * cm
+CARD_SPACING = 0.5 * cm
+FOOTER_Y = 1.5 * cm
+FOOTER_PAGE_X = 6 * cm            # Page label offset from the right edge
+
+# Page-break thresholds: start a new page when y drops below these
+SECTION_BREAK_Y = 10 * cm
+LIST_SECTION_BREAK_Y = 8 * cm
+INSIGHT_BREAK_Y = 5 * cm
+LIST_ITEM_BREAK_Y = 4 * cm
+CARD_BREAK_Y = 3 * cm
+
+# ---------- Canvas ----------
+class _StyledCanvas(canvas.Canvas):
+    """Canvas that skips font/color operators which would not change the current state"""
+    
+    def setFont(self, psfontname, size, leading=None):
+        if leading is None:
+            leading = size * 1.2
+        if (psfontname, size, leading) == (self._fontname, self._fontsize, self._leading):
+            return
+        super().setFont(psfontname, size, leading)
+    
+    def setFillColor(self, aColor, alpha=None):
+        if aColor is self._fillColorObj and alpha is None:
+            return
+        super().setFillColor(aColor, alpha)
+    
+    def setStrokeColor(self, aColor, alpha=None):
+        if aColor is self._strokeColorObj and alpha is None:
+            return
+        super().setStrokeColor(aColor, alpha)
+
 # ---------- Domain models ----------
 class ReportModel(BaseModel):
     """Report model for template parser format"""
@@ -34,80 +132,164 @@ class ReportModel(BaseModel):
     limitations: List[str] = Field(default_factory=list)
     next_steps: List[str] = Field(default_factory=list)
 
+@dataclass
+class ColumnarData:
+    """Column-oriented view of the leading query result rows used for charts/tables"""
+    columns: Dict[str, List[Any]]
+    nrows: int  # Total rows in the query result, not just those held in columns
+    
+    @classmethod
+    def from_rows(cls, rows: List[Dict], limit: int) -> "ColumnarData":
+        """Transpose the first `limit` dict rows, keyed by the first row's fields"""
+        head = [row for row in islice(rows, limit) if isinstance(row, dict)]
+        # Fields missing from ragged rows become blank cells/labels (0 in charts)
+        columns = {key: [row.get(key, "") for row in head] for key in rows[0].keys()}
+        return cls(columns=columns, nrows=len(rows))
+
 # ---------- Parser functions ----------
+_FIELD_LABELS = {
+    'Title': 'title',
+    'Executive Summary': 'executive_summary',
+    'Timeframe': 'timeframe',
+    'Dataset used': 'dataset_used',
+    'Key Metrics': 'key_metrics',
+    'Insights': 'insights',
+    'Findings': 'findings',
+    'Recommendations': 'recommendations',
+    'Limitations': 'limitations',
+    'Next Steps': 'next_steps',
+}
+
+def _json_loads(text: str) -> Any:
+    """Decode JSON, deferring to the stdlib parser for input orjson rejects (e.g. NaN)"""
+    try:
+        return _fast_json_loads(text)
+    except ValueError:
+        return json.loads(text)
+
+@lru_cache(maxsize=256)
+def _safe_literal(value: str) -> Any:
+    """Evaluate a list literal, falling back to an empty list (cached, do not mutate)"""
+    # JSON-compatible lists go through the C parser, Python literals through ast.
+    # A single quote before any double quote can't be JSON: skip straight to ast
+    single, double = value.find("'"), value.find('"')
+    if single == -1 or -1 < double < single:
+        try:
+            return _json_loads(value)
+        except ValueError:
+            pass
+    try:
+        return ast.literal_eval(value)
+    except:
+        return []
+
 def _parse_template_format(text: str) -> Dict[str, Any]:
     """Parse template-based format into dict"""
     result = {}
     
-    # Define patterns for each field
-    patterns = {
-        'title': r'^Title:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'executive_summary': r'^Executive Summary:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'timeframe': r'^Timeframe:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'dataset_used': r'^Dataset used:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'key_metrics': r'^Key Metrics:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'insights': r'^Insights:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'findings': r'^Findings:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'recommendations': r'^Recommendations:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'limitations': r'^Limitations:\s*(.+?)(?=\n[A-Z]|\Z)',
-        'next_steps': r'^Next Steps:\s*(.+?)(?=\n[A-Z]|\Z)'
-    }
+    # Single line scan: a "Label:" line opens a field, any other line starting
+    # with a capital letter closes it, remaining lines continue the open field.
+    # A label with nothing after the colon takes the next non-blank line as its
+    # value whatever its case (e.g. "Title:\nQuarterly Report")
+    sections = []
+    current = None
+    awaiting_value = False
+    for line in text.split('\n'):
+        label, colon, rest = line.partition(':')
+        field = _FIELD_LABELS.get(label) if colon else None
+        if field:
+            current = (field, [rest])
+            sections.append(current)
+            awaiting_value = not rest.strip()
+        elif current is not None and (awaiting_value or not 'A' <= line[:1] <= 'Z'):
+            current[1].append(line)
+            awaiting_value = awaiting_value and not line.strip()
+        else:
+            current = None
     
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text, re.MULTILINE | re.DOTALL)
-        if match:
-            value = match.group(1).strip()
-            
+    for field, lines in sections:
+        value = '\n'.join(lines).strip()
+        if value and field not in result:  # First occurrence wins
             # Try to parse lists and dicts
             if value.startswith('['):
-                try:
-                    result[field] = ast.literal_eval(value)
-                except:
-                    result[field] = []
+                result[field] = _safe_literal(value)
             else:
                 result[field] = value
     
     return result
 
+# ---------- Text helpers ----------
+@lru_cache(maxsize=512)
+def _wrap_cached(text: str, width: int) -> tuple[str, ...]:
+    """Wrap text to width, cached for repeated strings"""
+    # Short single-line text without tabs/newlines/trailing space wraps to itself
+    if 0 < len(text) <= width and text.isprintable() and text[-1] != ' ':
+        return (text,)
+    return tuple(textwrap.wrap(text, width=width))
+
+def _draw_text_block(c, lines: tuple[str, ...], x: float, y: float, indent: float = 0) -> None:
+    """Draw lines as one text object at the canvas font and leading, indenting all but the first"""
+    if not lines:
+        return
+    tx = c.beginText(x, y)
+    tx.textLine(lines[0])
+    if indent:
+        tx.moveCursor(indent, 0)
+    tx.textLines(lines[1:])
+    c.drawText(tx)
+
 # ---------- Chart generation functions ----------
-def _create_bar_chart(c, data: List[Dict], x: float, y: float, width: float, height: float, 
+def _to_float(value: Any) -> float:
+    """Coerce a chart value to float, mapping non-numeric values to 0"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value is None:
+        return 0.0
+    try:
+        return float(value)  # Numeric strings, Decimal, ...
+    except (TypeError, ValueError):
+        return 0.0
+
+def _chart_stats(values: List[float]) -> tuple[float, float]:
+    """Return (axis max, total) of non-empty chart values in one pass"""
+    vmax = values[0]
+    vsum = 0.0
+    for v in values:
+        if v > vmax:
+            vmax = v
+        vsum += v
+    return vmax * 1.1, vsum
+
+def _create_bar_chart(c, data: ColumnarData, x: float, y: float, width: float, height: float, 
                      title: str = "", key_field: str = None, value_field: str = None) -> float:
     """Create a bar chart from data"""
-    from reportlab.lib import colors
-    from reportlab.graphics.shapes import Drawing, Rect, String
-    from reportlab.graphics.charts.barcharts import VerticalBarChart
-    from reportlab.graphics import renderPDF
-    
-    if not data or not isinstance(data, list):
+    if data is None or not data.columns:
         return y
     
     # Auto-detect fields if not specified
-    if not key_field and isinstance(data[0], dict):
-        keys = list(data[0].keys())
-        key_field = keys[0] if keys else None
+    keys = list(data.columns)
+    if not key_field:
+        key_field = keys[0]
     
-    if not value_field and isinstance(data[0], dict):
-        keys = list(data[0].keys())
-        value_field = keys[1] if len(keys) > 1 else keys[0] if keys else None
+    if not value_field:
+        value_field = keys[1] if len(keys) > 1 else keys[0]
     
-    if not key_field or not value_field:
-        return y
-    
-    # Prepare data
-    labels = []
-    values = []
-    
-    for item in data[:10]:  # Limit to 10 items for visibility
-        if isinstance(item, dict):
-            labels.append(str(item.get(key_field, ""))[:10])  # Truncate labels
-            try:
-                values.append(float(item.get(value_field, 0)))
-            except:
-                values.append(0)
+    # Prepare data (limit to 10 items for visibility)
+    labels = [str(v)[:10] for v in data.columns[key_field][:10]]  # Truncate labels
+    values = [_to_float(v) for v in data.columns[value_field][:10]]
     
     if not values:
         return y
     
+    # Nothing to draw above a zero baseline: note it instead of an empty chart
+    value_max, _ = _chart_stats(values)
+    if value_max <= 0:
+        c.setFont("Helvetica-Oblique", 8)
+        c.setFillColor(C_MUTED)
+        c.drawString(x, y - 10, f"* {title or 'Chart'} omitted: no positive values to plot")
+        c.setFillColor(colors.black)
+        return y - 25
+    
     # Create drawing and chart
     d = Drawing(width, height)
     
@@ -126,10 +308,10 @@ def _create_bar_chart(c, data: List[Dict], x: float, y: float, width: float, hei
     bc.data = [values]
     bc.categoryAxis.categoryNames = labels
     bc.valueAxis.valueMin = 0
-    bc.valueAxis.valueMax = max(values) * 1.1
+    bc.valueAxis.valueMax = value_max
     
     # Styling
-    bc.bars[0].fillColor = colors.HexColor('#3498DB')
+    bc.bars[0].fillColor = C_ACCENT
     bc.categoryAxis.labels.boxAnchor = 'n'
     bc.categoryAxis.labels.angle = 45 if len(labels) > 5 else 0
     bc.categoryAxis.labels.dy = -8
@@ -143,42 +325,28 @@ def _create_bar_chart(c, data: List[Dict], x: float, y: float, width: float, hei
     
     return y - height - 20
 
-def _create_pie_chart(c, data: List[Dict], x: float, y: float, width: float, height: float,
+def _create_pie_chart(c, data: ColumnarData, x: float, y: float, width: float, height: float,
                      title: str = "", key_field: str = None, value_field: str = None) -> float:
     """Create a pie chart from data"""
-    from reportlab.lib import colors
-    from reportlab.graphics.shapes import Drawing, String
-    from reportlab.graphics.charts.piecharts import Pie
-    from reportlab.graphics import renderPDF
-    
-    if not data or not isinstance(data, list):
+    if data is None or not data.columns:
         return y
     
     # Auto-detect fields
-    if not key_field and isinstance(data[0], dict):
-        keys = list(data[0].keys())
-        key_field = keys[0] if keys else None
+    keys = list(data.columns)
+    if not key_field:
+        key_field = keys[0]
     
-    if not value_field and isinstance(data[0], dict):
-        keys = list(data[0].keys())
-        value_field = keys[1] if len(keys) > 1 else keys[0] if keys else None
-    
-    if not key_field or not value_field:
-        return y
+    if not value_field:
+        value_field = keys[1] if len(keys) > 1 else keys[0]
     
     # Prepare data (limit to top 8 for visibility)
-    labels = []
-    values = []
-    
-    for item in data[:8]:
-        if isinstance(item, dict):
-            labels.append(str(item.get(key_field, "")))
-            try:
-                values.append(float(item.get(value_field, 0)))
-            except:
-                values.append(0)
+    labels = [str(v) for v in data.columns[key_field][:8]]
+    values = [_to_float(v) for v in data.columns[value_field][:8]]
     
-    if not values or sum(values) == 0:
+    if not values:
+        return y
+    _, total = _chart_stats(values)
+    if total == 0:
         return y
     
     # Create drawing
@@ -201,18 +369,7 @@ def _create_pie_chart(c, data: List[Dict], x: float, y: float, width: float, hei
     pie.slices.strokeWidth = 0.5
     
     # Color scheme
-    color_palette = [
-        colors.HexColor('#3498DB'),
-        colors.HexColor('#2ECC71'),
-        colors.HexColor('#F39C12'),
-        colors.HexColor('#E74C3C'),
-        colors.HexColor('#9B59B6'),
-        colors.HexColor('#1ABC9C'),
-        colors.HexColor('#34495E'),
-        colors.HexColor('#F1C40F')
-    ]
-    
-    for i, color in enumerate(color_palette[:len(values)]):
+    for i, color in enumerate(PIE_PALETTE[:len(values)]):
         pie.slices[i].fillColor = color
         pie.slices[i].labelRadius = 1.2
         pie.slices[i].fontSize = 7
@@ -226,161 +383,174 @@ def _create_pie_chart(c, data: List[Dict], x: float, y: float, width: float, hei
 
 def _draw_header(c, title: str, page_width: float, page_height: float) -> float:
     """Draw a professional header with gradient effect"""
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    
-    # Draw gradient background (simulated with multiple rectangles)
-    gradient_colors = [
-        colors.HexColor('#2C3E50'),
-        colors.HexColor('#34495E'),
-        colors.HexColor('#3D5A6C')
-    ]
-    
-    header_height = 3 * cm
-    for i, color in enumerate(gradient_colors):
-        c.setFillColor(color)
-        c.rect(0, page_height - header_height + (i * 0.3 * cm), 
-               page_width, header_height - (i * 0.3 * cm), 
-               fill=1, stroke=0)
+    # Draw gradient background as one shading clipped to the header band,
+    # with stops at the old 0.3cm band offsets (0.1 and 0.2 of 3cm)
+    header_height = HEADER_HEIGHT
+    c.saveState()
+    p = c.beginPath()
+    p.rect(0, page_height - header_height, page_width, header_height)
+    c.clipPath(p, stroke=0, fill=0)
+    c.linearGradient(0, page_height - header_height, 0, page_height,
+                     HEADER_GRADIENT, positions=(0.0, 0.1, 0.2), extend=False)
+    c.restoreState()
     
     # Add company/report title
     c.setFillColor(colors.white)
     c.setFont("Helvetica-Bold", 22)
-    c.drawString(2 * cm, page_height - 1.8 * cm, title)
+    c.drawString(MARGIN, page_height - HEADER_TITLE_Y, title)
     
     # Add date
     c.setFont("Helvetica", 10)
-    c.drawString(2 * cm, page_height - 2.3 * cm, 
+    c.drawString(MARGIN, page_height - HEADER_DATE_Y, 
                 f"Generated: {datetime.now().strftime('%B %d, %Y')}")
     
     # Add decorative line
-    c.setStrokeColor(colors.HexColor('#3498DB'))
+    c.setStrokeColor(C_ACCENT)
     c.setLineWidth(2)
     c.line(0, page_height - header_height, page_width, page_height - header_height)
     
-    return page_height - header_height - 0.5 * cm
+    return page_height - header_height - HEADER_GAP
+
+# Fixed table styling, built once (Table.setStyle only reads it)
+_TABLE_STYLE = TableStyle([
+    # Header styling
+    ('BACKGROUND', (0, 0), (-1, 0), C_ACCENT),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+    
+    # Body styling
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, C_BORDER),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, C_BG_ROW]),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('TOPPADDING', (0, 1), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
+])
+
+def _format_float(value: Any) -> str:
+    """Format a float cell with thousands separators and 2 decimals"""
+    try:
+        return f"{value:,.2f}"
+    except (TypeError, ValueError):
+        return str(value)
+
+def _format_int(value: Any) -> str:
+    """Format an integer cell with thousands separators"""
+    try:
+        return f"{value:,}"
+    except (TypeError, ValueError):
+        return str(value)
+
+def _format_cell(value: Any) -> str:
+    """Format a cell by its own type (for columns mixing numbers with other values)"""
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+def _pick_formatter(column: List[Any]) -> Callable[[Any], str]:
+    """Choose one formatter for a column whose non-blank values share a kind, else format per cell"""
+    kinds = {
+        float if isinstance(v, float) else int if isinstance(v, int) else str
+        for v in column if v is not None and v != ""
+    }
+    if kinds == {float}:
+        return _format_float
+    if kinds == {int}:
+        return _format_int
+    if kinds <= {str}:
+        return str
+    return _format_cell
 
-def _draw_styled_table(c, data: List[Dict], x: float, y: float, page_width: float, 
+def _draw_styled_table(c, data: ColumnarData, x: float, y: float, page_width: float, 
                       title: str = "", max_rows: int = 15) -> float:
     """Draw a styled table with alternating row colors"""
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    from reportlab.platypus import Table, TableStyle
-    
-    if not data or not isinstance(data, list):
+    if data is None or not data.columns:
         return y
     
     # Title
     if title:
         c.setFont("Helvetica-Bold", 12)
-        c.setFillColor(colors.HexColor('#2C3E50'))
+        c.setFillColor(C_PRIMARY)
         c.drawString(x, y, title)
         c.setFillColor(colors.black)
         y -= 20
     
     # Prepare table data
-    if data and isinstance(data[0], dict):
-        columns = list(data[0].keys())
-        
-        # Format column headers
-        headers = [col.replace('_', ' ').title() for col in columns]
-        
-        # Create rows
-        rows = []
-        for item in data[:max_rows]:
-            row = []
-            for col in columns:
-                value = item.get(col, "")
-                # Format numbers
-                if isinstance(value, (int, float)):
-                    if isinstance(value, float):
-                        row.append(f"{value:,.2f}")
-                    else:
-                        row.append(f"{value:,}")
-                else:
-                    row.append(str(value))
-            rows.append(row)
-        
-        # Combine headers and rows
-        table_data = [headers] + rows
-        
-        # Calculate column widths
-        available_width = page_width - (2 * x)
-        col_count = len(columns)
-        col_widths = [available_width / col_count] * col_count
-        
-        # Create table
-        t = Table(table_data, colWidths=col_widths)
-        
-        # Apply modern styling
-        style = TableStyle([
-            # Header styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-            
-            # Body styling
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), 
-             [colors.white, colors.HexColor('#ECF0F1')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 1), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6),
-        ])
-        
-        t.setStyle(style)
-        
-        # Calculate height and draw
-        w, h = t.wrapOn(c, available_width, 20 * cm)
-        
-        # Check if fits on page
-        if y - h < 2 * cm:
-            c.showPage()
-            y = 27 * cm
-        
-        t.drawOn(c, x, y - h)
-        y = y - h - 10
-        
-        # Add summary if data was truncated
-        if len(data) > max_rows:
-            c.setFont("Helvetica-Oblique", 8)
-            c.setFillColor(colors.HexColor('#7F8C8D'))
-            c.drawString(x, y, f"* Showing {max_rows} of {len(data)} total records")
-            c.setFillColor(colors.black)
-            y -= 15
+    columns = list(data.columns)
+    
+    # Format column headers
+    headers = [col.replace('_', ' ').title() for col in columns]
+    
+    # Format column by column with one formatter per column, then transpose into rows
+    formatted = []
+    for col in columns:
+        values = data.columns[col][:max_rows]
+        formatted.append(list(map(_pick_formatter(values), values)))
+    rows = [list(row) for row in zip(*formatted)]
+    
+    # Combine headers and rows
+    table_data = [headers] + rows
+    
+    # Calculate column widths
+    available_width = page_width - (2 * x)
+    col_count = len(columns)
+    col_widths = [available_width / col_count] * col_count
+    
+    # Create table
+    t = Table(table_data, colWidths=col_widths)
+    
+    # Apply modern styling
+    t.setStyle(_TABLE_STYLE)
+    
+    # Calculate height and draw
+    w, h = t.wrapOn(c, available_width, TABLE_MAX_HEIGHT)
+    
+    # Check if fits on page
+    if y - h < BOTTOM_MARGIN:
+        c.showPage()
+        y = PAGE_TOP_Y
+    
+    t.drawOn(c, x, y - h)
+    y = y - h - 10
+    
+    # Add summary if data was truncated
+    if data.nrows > max_rows:
+        c.setFont("Helvetica-Oblique", 8)
+        c.setFillColor(C_MUTED)
+        c.drawString(x, y, f"* Showing {max_rows} of {data.nrows} total records")
+        c.setFillColor(colors.black)
+        y -= 15
     
     return y
 
 def _draw_metric_cards(c, metrics: List[Dict], x: float, y: float, page_width: float) -> float:
     """Draw metrics as styled cards"""
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    
     if not metrics:
         return y
     
     # Title
     c.setFont("Helvetica-Bold", 14)
-    c.setFillColor(colors.HexColor('#2C3E50'))
+    c.setFillColor(C_PRIMARY)
     c.drawString(x, y, "Key Metrics")
     c.setFillColor(colors.black)
     y -= 25
     
     # Draw metric cards in a grid
-    card_width = 7 * cm
-    card_height = 2 * cm
+    card_width = CARD_WIDTH
+    card_height = CARD_HEIGHT
     cards_per_row = 2
-    spacing = 0.5 * cm
+    spacing = CARD_SPACING
     
     # Store initial y for consistent row positioning
     start_y = y
     
-    for i, metric in enumerate(metrics[:10]):
+    for i, metric in enumerate(islice(metrics, 10)):
         row = i // cards_per_row
         col = i % cards_per_row
         
@@ -388,16 +558,16 @@ def _draw_metric_cards(c, metrics: List[Dict], x: float, y: float, page_width: f
         card_y = start_y - row * (card_height + spacing)
         
         # Check if need new page
-        if card_y - card_height < 3 * cm:
+        if card_y - card_height < CARD_BREAK_Y:
             c.showPage()
-            start_y = 27 * cm
+            start_y = PAGE_TOP_Y
             card_y = start_y - (row * (card_height + spacing))
         
         # Draw card background
-        c.setFillColor(colors.HexColor('#F8F9FA'))
+        c.setFillColor(C_BG_CARD)
         c.roundRect(card_x, card_y - card_height, card_width, card_height, 
                    5, fill=1, stroke=1)
-        c.setStrokeColor(colors.HexColor('#BDC3C7'))
+        c.setStrokeColor(C_BORDER)
         c.setLineWidth(0.5)
         c.roundRect(card_x, card_y - card_height, card_width, card_height, 
                    5, fill=0, stroke=1)
@@ -405,25 +575,25 @@ def _draw_metric_cards(c, metrics: List[Dict], x: float, y: float, page_width: f
         # Add metric content
         if isinstance(metric, dict):
             # Get first two key-value pairs
-            items = list(metric.items())[:2]
+            items = list(islice(metric.items(), 2))
             
             if items:
                 # Primary metric (larger font)
                 key, value = items[0]
                 c.setFont("Helvetica", 10)
-                c.setFillColor(colors.HexColor('#7F8C8D'))
+                c.setFillColor(C_MUTED)
                 c.drawString(card_x + 10, card_y - 20, 
                            key.replace('_', ' ').title())
                 
                 c.setFont("Helvetica-Bold", 16)
-                c.setFillColor(colors.HexColor('#2C3E50'))
+                c.setFillColor(C_PRIMARY)
                 c.drawString(card_x + 10, card_y - 40, str(value))
                 
                 # Secondary metric (if exists)
                 if len(items) > 1:
                     key, value = items[1]
                     c.setFont("Helvetica", 9)
-                    c.setFillColor(colors.HexColor('#95A5A6'))
+                    c.setFillColor(C_SUBTLE)
                     c.drawString(card_x + 10, card_y - 55, 
                                f"{key.replace('_', ' ').title()}: {value}")
         
@@ -437,41 +607,38 @@ def _draw_metric_cards(c, metrics: List[Dict], x: float, y: float, page_width: f
 
 def _draw_insights_section(c, insights: List, x: float, y: float, page_width: float) -> float:
     """Draw insights with icons and styling"""
-    from reportlab.lib import colors
-    from reportlab.lib.units import cm
-    
     if not insights:
         return y
     
     # Section title
     c.setFont("Helvetica-Bold", 14)
-    c.setFillColor(colors.HexColor('#2C3E50'))
+    c.setFillColor(C_PRIMARY)
     c.drawString(x, y, "Key Insights")
     c.setFillColor(colors.black)
     y -= 20
     
-    for i, insight in enumerate(insights[:8], 1):
+    for i, insight in enumerate(islice(insights, 8), 1):
         # Check page break with more buffer
-        if y < 5 * cm:  # Increased buffer for better spacing
+        if y < INSIGHT_BREAK_Y:  # Increased buffer for better spacing
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
             # Redraw section title on new page
             c.setFont("Helvetica-Bold", 14)
-            c.setFillColor(colors.HexColor('#2C3E50'))
+            c.setFillColor(C_PRIMARY)
             c.drawString(x, y, "Key Insights (continued)")
             c.setFillColor(colors.black)
             y -= 20
         
         # Draw insight number in circle
-        c.setFillColor(colors.HexColor('#3498DB'))
+        c.setFillColor(C_ACCENT)
         c.circle(x + 10, y - 5, 8, fill=1, stroke=0)
         c.setFillColor(colors.white)
         c.setFont("Helvetica-Bold", 10)
         c.drawString(x + 7, y - 8, str(i))
         
         # Draw insight text
-        c.setFillColor(colors.HexColor('#2C3E50'))
-        c.setFont("Helvetica", 10)
+        c.setFillColor(C_PRIMARY)
+        c.setFont("Helvetica", 10, 14)
         
         text = ""
         if isinstance(insight, dict):
@@ -480,12 +647,11 @@ def _draw_insights_section(c, insights: List, x: float, y: float, page_width: fl
             text = str(insight)
         
         # Wrap text
-        wrapped = textwrap.wrap(text, width=90)
+        wrapped = _wrap_cached(text, 90)
         text_x = x + 25
         
-        for line in wrapped:
-            c.drawString(text_x, y - 8, line)
-            y -= 14
+        _draw_text_block(c, wrapped, text_x, y - 8)
+        y -= 14 * len(wrapped)
         
         y -= 8
     
@@ -496,19 +662,11 @@ def _draw_insights_section(c, insights: List, x: float, y: float, page_width: fl
 def _write_visual_pdf(report: ReportModel, query_data: Optional[List[Dict]], 
                      out_path: Path, chart_type: str = "Auto") -> None:
     """Write enhanced PDF with visualizations and styling"""
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import cm
-        from reportlab.lib import colors
-    except ImportError:
-        raise RuntimeError(
-            "Missing dependency: reportlab. Install with: pip install reportlab"
-        )
-    
-    c = canvas.Canvas(str(out_path), pagesize=A4)
+    # Render in memory and write the file in one go once the PDF is complete
+    buf = io.BytesIO()
+    c = _StyledCanvas(buf, pagesize=A4)
     page_width, page_height = A4
-    x = 2 * cm
+    x = MARGIN
     
     # Draw header
     y = _draw_header(c, report.title, page_width, page_height)
@@ -516,174 +674,164 @@ def _write_visual_pdf(report: ReportModel, query_data: Optional[List[Dict]],
     # Executive Summary with styling
     if report.executive_summary:
         # Draw summary box
-        c.setFillColor(colors.HexColor('#EBF5FB'))
+        c.setFillColor(C_BG_SUMMARY)
         c.roundRect(x - 10, y - 60, page_width - 2*x + 20, 50, 5, fill=1, stroke=1)
-        c.setStrokeColor(colors.HexColor('#3498DB'))
+        c.setStrokeColor(C_ACCENT)
         c.setLineWidth(1)
         c.roundRect(x - 10, y - 60, page_width - 2*x + 20, 50, 5, fill=0, stroke=1)
         
         # Summary text
-        c.setFillColor(colors.HexColor('#2C3E50'))
-        c.setFont("Helvetica", 11)
-        wrapped = textwrap.wrap(report.executive_summary, width=80)
-        text_y = y - 20
-        for line in wrapped[:3]:  # Max 3 lines
-            c.drawString(x, text_y, line)
-            text_y -= 14
+        c.setFillColor(C_PRIMARY)
+        c.setFont("Helvetica", 11, 14)
+        wrapped = _wrap_cached(report.executive_summary, 80)
+        _draw_text_block(c, wrapped[:3], x, y - 20)  # Max 3 lines
         
         y -= 70
         c.setFillColor(colors.black)
     
+    # Transpose the rows charts and the table can show (at most 15) once
+    columnar = None
+    if query_data and isinstance(query_data, list) and isinstance(query_data[0], dict):
+        columnar = ColumnarData.from_rows(query_data, limit=15)
+    
     # Visualizations from query data - only if chart_type is not "None"
-    if chart_type != "None" and query_data and isinstance(query_data, list) and query_data:
-        # Determine data structure
-        if isinstance(query_data[0], dict):
-            keys = list(query_data[0].keys())
-            
-            # Find numeric field
-            numeric_field = None
-            for key in keys:
-                if isinstance(query_data[0].get(key), (int, float)):
-                    numeric_field = key
-                    break
+    if chart_type != "None" and columnar is not None:
+        # Find numeric field
+        numeric_field = None
+        for key, column in columnar.columns.items():
+            if isinstance(column[0], (int, float)):
+                numeric_field = key
+                break
+        
+        # Draw charts based on chart_type setting
+        if numeric_field:
+            if chart_type in ["Auto", "Bar", "Both"]:
+                if columnar.nrows <= 15:
+                    y = _create_bar_chart(c, columnar, x, y, 
+                                        page_width - 2*x, 200,
+                                        title="Data Distribution",
+                                        value_field=numeric_field)
             
-            # Draw charts based on chart_type setting
-            if numeric_field:
-                if chart_type in ["Auto", "Bar", "Both"]:
-                    if len(query_data) <= 15:
-                        y = _create_bar_chart(c, query_data, x, y, 
-                                            page_width - 2*x, 200,
-                                            title="Data Distribution",
-                                            value_field=numeric_field)
-                
-                if chart_type in ["Auto", "Pie", "Both"]:
-                    if len(query_data) >= 3:
-                        y = _create_pie_chart(c, query_data[:8], x, y,
-                                            page_width - 2*x, 200,
-                                            title="Top Items Distribution",
-                                            value_field=numeric_field)
+            if chart_type in ["Auto", "Pie", "Both"]:
+                if columnar.nrows >= 3:
+                    y = _create_pie_chart(c, columnar, x, y,
+                                        page_width - 2*x, 200,
+                                        title="Top Items Distribution",
+                                        value_field=numeric_field)
     
     # Metric cards
     if report.key_metrics:
-        if y < 10 * cm:
+        if y < SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
         y = _draw_metric_cards(c, report.key_metrics, x, y, page_width)
     
     # Data table from query results
     if query_data and isinstance(query_data, list):
-        if y < 10 * cm:
+        if y < SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
-        y = _draw_styled_table(c, query_data, x, y, page_width, 
+        y = _draw_styled_table(c, columnar, x, y, page_width, 
                               title="Detailed Results", max_rows=15)
     
     # Insights section
     if report.insights:
-        if y < 10 * cm:
+        if y < SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
         y = _draw_insights_section(c, report.insights, x, y, page_width)
     
     # Findings with bullets
     if report.findings:
-        if y < 8 * cm:
+        if y < LIST_SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
         
         c.setFont("Helvetica-Bold", 14)
-        c.setFillColor(colors.HexColor('#2C3E50'))
+        c.setFillColor(C_PRIMARY)
         c.drawString(x, y, "Detailed Findings")
         c.setFillColor(colors.black)
         y -= 20
         
-        for finding in report.findings[:10]:
+        for finding in islice(report.findings, 10):
             # Check if we need a new page before starting a finding
-            if y < 4 * cm:  # Increased buffer
+            if y < LIST_ITEM_BREAK_Y:  # Increased buffer
                 c.showPage()
-                y = 27 * cm
+                y = PAGE_TOP_Y
                 # Redraw section title on new page
                 c.setFont("Helvetica-Bold", 14)
-                c.setFillColor(colors.HexColor('#2C3E50'))
+                c.setFillColor(C_PRIMARY)
                 c.drawString(x, y, "Detailed Findings (continued)")
                 c.setFillColor(colors.black)
                 y -= 20
             
-            c.setFont("Helvetica", 10)
+            c.setFont("Helvetica", 10, 14)
             # Draw bullet
-            c.setFillColor(colors.HexColor('#3498DB'))
+            c.setFillColor(C_ACCENT)
             c.circle(x + 5, y - 4, 2, fill=1, stroke=0)
             c.setFillColor(colors.black)
             # Draw text
-            wrapped = textwrap.wrap(finding, width=85)
-            for j, line in enumerate(wrapped):
-                if j == 0:
-                    c.drawString(x + 15, y - 5, line)
-                else:
-                    c.drawString(x + 15, y - 5, line)
-                y -= 14
+            wrapped = _wrap_cached(finding, 85)
+            _draw_text_block(c, wrapped, x + 15, y - 5)
+            y -= 14 * len(wrapped)
             y -= 5
     
     # Recommendations with icons
     if report.recommendations:
-        if y < 8 * cm:
+        if y < LIST_SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
         
         c.setFont("Helvetica-Bold", 14)
-        c.setFillColor(colors.HexColor('#27AE60'))
+        c.setFillColor(C_SUCCESS)
         c.drawString(x, y, "Recommendations")
         c.setFillColor(colors.black)
         y -= 20
         
-        for i, rec in enumerate(report.recommendations[:8], 1):
+        for i, rec in enumerate(islice(report.recommendations, 8), 1):
             # Check if we need a new page before starting a recommendation
-            if y < 4 * cm:  # Increased buffer
+            if y < LIST_ITEM_BREAK_Y:  # Increased buffer
                 c.showPage()
-                y = 27 * cm
+                y = PAGE_TOP_Y
                 # Redraw section title on new page
                 c.setFont("Helvetica-Bold", 14)
-                c.setFillColor(colors.HexColor('#27AE60'))
+                c.setFillColor(C_SUCCESS)
                 c.drawString(x, y, "Recommendations (continued)")
                 c.setFillColor(colors.black)
                 y -= 20
             
             # Draw check icon
-            c.setStrokeColor(colors.HexColor('#27AE60'))
+            c.setStrokeColor(C_SUCCESS)
             c.setLineWidth(2)
             c.line(x + 3, y - 3, x + 6, y - 6)
             c.line(x + 6, y - 6, x + 12, y + 2)
             c.setStrokeColor(colors.black)  # Reset stroke color
             c.setLineWidth(1)  # Reset line width
             
-            c.setFont("Helvetica", 10)
-            c.setFillColor(colors.HexColor('#2C3E50'))
-            wrapped = textwrap.wrap(rec, width=85)
-            for j, line in enumerate(wrapped):
-                if j == 0:
-                    c.drawString(x + 20, y - 5, line)
-                else:
-                    c.drawString(x + 20, y - 5, line)
-                y -= 14
+            c.setFont("Helvetica", 10, 14)
+            c.setFillColor(C_PRIMARY)
+            wrapped = _wrap_cached(rec, 85)
+            _draw_text_block(c, wrapped, x + 20, y - 5)
+            y -= 14 * len(wrapped)
             y -= 5
         
         c.setFillColor(colors.black)  # Reset fill color
     
     # Limitations and Next Steps in columns
     if report.limitations or report.next_steps:
-        if y < 10 * cm:
+        if y < SECTION_BREAK_Y:
             c.showPage()
-            y = 27 * cm
+            y = PAGE_TOP_Y
         else:
             y -= 15  # Add spacing between sections
         
@@ -696,23 +844,20 @@ def _write_visual_pdf(report: ReportModel, query_data: Optional[List[Dict]],
         # Limitations column
         if report.limitations:
             c.setFont("Helvetica-Bold", 12)
-            c.setFillColor(colors.HexColor('#E67E22'))
+            c.setFillColor(C_WARN)
             c.drawString(x, y, "Limitations")
             c.setFillColor(colors.black)
             temp_y = y - 18
             
-            c.setFont("Helvetica", 9)
-            for lim in report.limitations[:5]:
+            c.setFont("Helvetica", 9, 12)
+            for lim in islice(report.limitations, 5):
                 # Wrap text properly
-                wrapped = textwrap.wrap(lim, width=40)
+                wrapped = _wrap_cached(lim, 40)
                 if wrapped:
-                    # First line with bullet
-                    c.drawString(x + 5, temp_y, f"• {wrapped[0]}")
-                    temp_y -= 12
-                    # Continuation lines without bullet
-                    for line in wrapped[1:]:
-                        c.drawString(x + 12, temp_y, line)
-                        temp_y -= 12
+                    # First line with bullet, continuation lines indented past it
+                    _draw_text_block(c, (f"• {wrapped[0]}",) + wrapped[1:],
+                                     x + 5, temp_y, indent=7)
+                    temp_y -= 12 * len(wrapped)
                     temp_y -= 3  # Small gap between items
             
             lowest_y = min(lowest_y, temp_y)
@@ -720,23 +865,20 @@ def _write_visual_pdf(report: ReportModel, query_data: Optional[List[Dict]],
         # Next Steps column
         if report.next_steps:
             c.setFont("Helvetica-Bold", 12)
-            c.setFillColor(colors.HexColor('#8E44AD'))
+            c.setFillColor(C_PURPLE)
             c.drawString(x + col_width + 40, y, "Next Steps")
             c.setFillColor(colors.black)
             temp_y = y - 18
             
-            c.setFont("Helvetica", 9)
-            for step in report.next_steps[:5]:
+            c.setFont("Helvetica", 9, 12)
+            for step in islice(report.next_steps, 5):
                 # Wrap text properly
-                wrapped = textwrap.wrap(step, width=40)
+                wrapped = _wrap_cached(step, 40)
                 if wrapped:
-                    # First line with arrow
-                    c.drawString(x + col_width + 45, temp_y, f"→ {wrapped[0]}")
-                    temp_y -= 12
-                    # Continuation lines without arrow
-                    for line in wrapped[1:]:
-                        c.drawString(x + col_width + 52, temp_y, line)
-                        temp_y -= 12
+                    # First line with arrow, continuation lines indented past it
+                    _draw_text_block(c, (f"→ {wrapped[0]}",) + wrapped[1:],
+                                     x + col_width + 45, temp_y, indent=7)
+                    temp_y -= 12 * len(wrapped)
                     temp_y -= 3  # Small gap between items
             
             lowest_y = min(lowest_y, temp_y)
@@ -745,16 +887,17 @@ def _write_visual_pdf(report: ReportModel, query_data: Optional[List[Dict]],
     
     # Footer
     c.setFont("Helvetica-Oblique", 8)
-    c.setFillColor(colors.HexColor('#95A5A6'))
-    c.drawString(x, 1.5 * cm, f"Data Source: {report.dataset_used}")
-    c.drawString(page_width - 6*cm, 1.5 * cm, f"Page 1")
+    c.setFillColor(C_SUBTLE)
+    c.drawString(x, FOOTER_Y, f"Data Source: {report.dataset_used}")
+    c.drawString(page_width - FOOTER_PAGE_X, FOOTER_Y, f"Page 1")
     
     # Add footer line
-    c.setStrokeColor(colors.HexColor('#BDC3C7'))
+    c.setStrokeColor(C_BORDER)
     c.setLineWidth(0.5)
-    c.line(x, 2*cm, page_width - x, 2*cm)
+    c.line(x, BOTTOM_MARGIN, page_width - x, BOTTOM_MARGIN)
     
     c.save()
+    out_path.write_bytes(buf.getvalue())
 
 # ---------- Langflow Component ----------
 class VisualReportToPDF(Component):
@@ -810,6 +953,14 @@ class VisualReportToPDF(Component):
         ),
     ]
     
+    # Last parsed report/query results, keyed on the raw text they came from,
+    # so build_pdf and build_info don't each re-parse the same input
+    _report_cache: Optional[tuple] = None
+    _query_cache: Optional[tuple] = None
+    
+    # Output folders already created this session (shared by all instances)
+    _created_folders: set = set()
+    
     def _parse_report(self) -> ReportModel:
         """Parse report from template format"""
         try:
@@ -824,16 +975,37 @@ class VisualReportToPDF(Component):
                 else:
                     return ReportModel(**raw.data)
             
-            if isinstance(raw, str):
-                data = _parse_template_format(raw)
-            else:
-                data = raw
+            if not isinstance(raw, str):
+                return ReportModel(**raw)
+            
+            cached = self._report_cache
+            if cached is not None and cached[0] == raw:
+                return cached[1]
             
-            return ReportModel(**data)
+            report = ReportModel(**_parse_template_format(raw))
+            self._report_cache = (raw, report)
+            return report
             
         except Exception as e:
             raise ValueError(f"Failed to parse report: {e}")
     
+    def _parse_results_json(self, text: str) -> Optional[List[Dict]]:
+        """Decode query results sent as a JSON string"""
+        cached = self._query_cache
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        
+        parsed = _json_loads(text)
+        if isinstance(parsed, dict) and 'results' in parsed:
+            results = parsed['results']
+        elif isinstance(parsed, list):
+            results = parsed
+        else:
+            results = None
+        
+        self._query_cache = (text, results)
+        return results
+    
     def _get_query_data(self) -> Optional[List[Dict]]:
         """Extract query results data"""
         if not self.query_results:
@@ -850,11 +1022,7 @@ class VisualReportToPDF(Component):
                 elif isinstance(data, list):
                     return data
                 elif isinstance(data, str):
-                    parsed = json.loads(data)
-                    if isinstance(parsed, dict) and 'results' in parsed:
-                        return parsed['results']
-                    elif isinstance(parsed, list):
-                        return parsed
+                    return self._parse_results_json(data)
             
             # Handle direct list
             elif isinstance(self.query_results, list):
@@ -862,11 +1030,7 @@ class VisualReportToPDF(Component):
             
             # Handle JSON string
             elif isinstance(self.query_results, str):
-                parsed = json.loads(self.query_results)
-                if isinstance(parsed, dict) and 'results' in parsed:
-                    return parsed['results']
-                elif isinstance(parsed, list):
-                    return parsed
+                return self._parse_results_json(self.query_results)
         
         except Exception as e:
             self.log(f"Could not parse query results: {e}")
@@ -888,7 +1052,10 @@ class VisualReportToPDF(Component):
         
         # Setup output path
         folder = Path(self.output_folder or ".")
-        folder.mkdir(parents=True, exist_ok=True)
+        folder_key = str(folder.absolute())
+        if folder_key not in self._created_folders:
+            folder.mkdir(parents=True, exist_ok=True)
+            self._created_folders.add(folder_key)
         
         file_name = (self.file_name or "report.pdf").strip() or "report.pdf"
         if not file_name.lower().endswith(".pdf"):
@@ -897,8 +1064,16 @@ class VisualReportToPDF(Component):
         out_path = folder / file_name
         
         try:
-            _write_visual_pdf(report, query_data, out_path, chart_type=self.chart_type)
+            try:
+                _write_visual_pdf(report, query_data, out_path, chart_type=self.chart_type)
+            except FileNotFoundError:
+                # The folder was removed after it was cached as created: recreate and retry once
+                if folder.is_dir():
+                    raise
+                folder.mkdir(parents=True, exist_ok=True)
+                _write_visual_pdf(report, query_data, out_path, chart_type=self.chart_type)
         except Exception as e:
+            self._created_folders.discard(folder_key)
             self.log(f"[VisualReportToPDF] PDF rendering failed: {e}")
             self.status = f"Rendering error: {e}"
             return Data(data={"error": str(e)}, text="Rendering failed.")
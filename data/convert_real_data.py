@@ -1,8 +1,75 @@
 import sqlite3
+from itertools import chain, islice
 import pandas as pd
 
+# Columns loaded from each ./data/<table>.csv
+TABLE_COLUMNS = {
+    'customers': ('id', 'first_name', 'last_name', 'email', 'state', 'verified'),
+    'products': ('id', 'name', 'category', 'price'),
+    'purchases': ('id', 'customer_id', 'product_id', 'amount', 'date'),
+}
+
+# Rows per multi-row INSERT; 100 rows x up to 6 columns stays under
+# SQLite's default limit of 999 bound variables per statement
+ROWS_PER_INSERT = 100
+
+def insert_rows(conn, table, columns, rows):
+    """Insert rows with multi-row VALUES statements, ROWS_PER_INSERT rows at a time"""
+    row_placeholders = '(' + ', '.join('?' * len(columns)) + ')'
+    insert = f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+    rows = iter(rows)
+    tail = []
+    
+    def batches():
+        while True:
+            batch = list(islice(rows, ROWS_PER_INSERT))
+            if len(batch) < ROWS_PER_INSERT:
+                tail.extend(batch)
+                return
+            yield tuple(chain.from_iterable(batch))
+    
+    conn.executemany(insert + ', '.join([row_placeholders] * ROWS_PER_INSERT), batches())
+    # Leftover rows that don't fill a whole statement
+    conn.executemany(insert + row_placeholders, tail)
+
+def enable_csv_vtab(conn):
+    """Load SQLite's csv virtual-table extension, returning False if it is unavailable"""
+    try:
+        conn.enable_load_extension(True)
+        try:
+            conn.load_extension('csv')
+        finally:
+            conn.enable_load_extension(False)
+        return True
+    except (AttributeError, sqlite3.Error):
+        # Python built without extension loading, or no csv extension installed
+        return False
+
+def copy_csv(conn, table, columns, path):
+    """Copy a CSV file into table entirely inside SQLite via the csv virtual table"""
+    filename = path.replace("'", "''")
+    conn.execute(f"CREATE VIRTUAL TABLE temp.csv_in USING csv(filename='{filename}', header=YES)")
+    try:
+        # The csv module yields text; the declared column affinities convert it
+        column_list = ', '.join(columns)
+        conn.execute(f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM temp.csv_in")
+    finally:
+        conn.execute('DROP TABLE temp.csv_in')
+
 def convert_csv_to_sqlite():
     conn = sqlite3.connect('gaming_transactions.db')
+    # Single writer for the whole run: hold the lock until close. Set before
+    # switching to WAL so SQLite skips the shared-memory WAL index entirely
+    conn.execute('PRAGMA locking_mode=EXCLUSIVE')
+    # Bulk-load tuning: WAL journal, fewer fsyncs, bigger cache, temp data in RAM
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-200000')  # ~200 MB
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA mmap_size=268435456')  # 256 MB
+    # Take the exclusive lock now rather than at the first write
+    conn.execute('BEGIN IMMEDIATE')
+    conn.commit()
     
     # Drop existing tables
     conn.execute('DROP TABLE IF EXISTS purchases')
@@ -14,7 +81,7 @@ def convert_csv_to_sqlite():
         id INTEGER PRIMARY KEY,
         first_name TEXT NOT NULL,
         last_name TEXT NOT NULL,
-        email TEXT UNIQUE NOT NULL,
+        email TEXT NOT NULL,  -- not unique: the source data reuses some addresses
         state TEXT NOT NULL,
         verified BOOLEAN NOT NULL
     )''')
@@ -36,25 +103,37 @@ def convert_csv_to_sqlite():
         FOREIGN KEY (product_id) REFERENCES products (id)
     )''')
     
-    # Load and insert data
-    customers = pd.read_csv('./data/customers.csv')
-    customers['verified'] = customers['verified'].astype(bool)
-    customers.to_sql('customers', conn, if_exists='replace', index=False)
-    
-    products = pd.read_csv('./data/products.csv')
-    products.to_sql('products', conn, if_exists='replace', index=False)
-    
-    purchases = pd.read_csv('./data/purchases.csv')
-    purchases['date'] = pd.to_datetime(purchases['date'])
-    purchases.to_sql('purchases', conn, if_exists='replace', index=False)
+    # Load and insert data into the tables declared above (keeping their
+    # keys and constraints), all in one transaction
+    with conn:
+        if enable_csv_vtab(conn):
+            # Native path: rows never become Python objects
+            for table, columns in TABLE_COLUMNS.items():
+                copy_csv(conn, table, columns, f'./data/{table}.csv')
+        else:
+            customers = pd.read_csv('./data/customers.csv', dtype={'verified': bool})
+            insert_rows(conn, 'customers', TABLE_COLUMNS['customers'],
+                        customers.itertuples(index=False, name=None))
+            
+            products = pd.read_csv('./data/products.csv')
+            insert_rows(conn, 'products', TABLE_COLUMNS['products'],
+                        products.itertuples(index=False, name=None))
+            
+            # Stream the large purchases file in chunks rather than loading it whole.
+            # Dates are already ISO 8601 text in the CSV, which is what SQLite stores
+            for purchases in pd.read_csv('./data/purchases.csv', chunksize=50000):
+                insert_rows(conn, 'purchases', TABLE_COLUMNS['purchases'],
+                            purchases.itertuples(index=False, name=None))
     
-    # Create indexes
+    # Create indexes only once all data is in, then gather planner stats
     conn.execute('CREATE INDEX idx_customers_state ON customers(state)')
     conn.execute('CREATE INDEX idx_products_category ON products(category)')
     conn.execute('CREATE INDEX idx_purchases_customer_id ON purchases(customer_id)')
     conn.execute('CREATE INDEX idx_purchases_date ON purchases(date)')
+    conn.execute('ANALYZE')
     
     conn.commit()
+    conn.execute('PRAGMA optimize')
     conn.close()
     print("Database created gaming_transactions.db")
 